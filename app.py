@@ -3,16 +3,30 @@ Smart Kitchen Inventory System
 A beginner-friendly Flask application for tracking kitchen items
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context, g, has_request_context
+from flask_caching import Cache
+from flask_session import Session
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
 from flask_sqlalchemy import SQLAlchemy
+from dotenv import load_dotenv
+from sqlalchemy import event, func, case, and_, select, text, literal_column, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import raiseload
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from datetime import datetime, timedelta
-from functools import wraps
+from datetime import datetime, date, timedelta
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import os
 import csv
-from io import StringIO, BytesIO
+from io import StringIO
 import sys
+import sqlite3
+import redis
+
+# Load settings from .env (variables already set in the environment win)
+load_dotenv(os.path.join(os.path.abspath(os.path.dirname(__file__)), '.env'))
 
 # Initialize Flask
 app = Flask(__name__)
@@ -21,11 +35,69 @@ app = Flask(__name__)
 basedir = os.path.abspath(os.path.dirname(__file__))
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(basedir, "db", "smart_kitchen.db")}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_pre_ping': True,
+    'query_cache_size': 1200,
+    'connect_args': {'check_same_thread': False, 'timeout': 30}
+}
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-this')
 
+app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'SimpleCache')  # per-process; gunicorn.conf.py switches to RedisCache
+app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+app.config['CACHE_DEFAULT_TIMEOUT'] = 60
+app.config['SESSION_TYPE'] = os.getenv('SESSION_TYPE', 'filesystem')  # redis in production; cookie only carries the session id
+app.config['SESSION_FILE_DIR'] = os.path.join(basedir, 'flask_session')
+session_redis_url = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/1')
+app.config['SESSION_REDIS'] = redis.Redis.from_url(session_redis_url)
+app.config['SESSION_PERMANENT'] = False
+app.config['RATELIMIT_STORAGE_URI'] = os.getenv('RATELIMIT_STORAGE_URI', session_redis_url)  # shared by all workers
+app.config['RATELIMIT_IN_MEMORY_FALLBACK_ENABLED'] = True  # keep login usable when Redis is unreachable
+
+# Password hashing method (fewer iterations than werkzeug's default keeps login fast)
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:150000'
+
+# Password hashing runs on this pool, which caps concurrent hashes at one per CPU.
+# Callers still block on .result(), so it adds no request concurrency (the KDF
+# already releases the GIL).
+auth_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Rows per bulk insert when importing CSV files
+IMPORT_BATCH_SIZE = 1000
+
+# (name, barcode) keys per duplicate lookup: 2 bind params each plus user_id
+# stays within SQLite's 999-variable limit on older builds
+DEDUP_BATCH_SIZE = 499
+
+# Rows encoded per streamed chunk when exporting CSV files
+EXPORT_BATCH_SIZE = 1000
+
 # Initialize Database
 db = SQLAlchemy(app)
 
+# Initialize Cache
+cache = Cache(app)
+
+# Initialize server-side sessions
+Session(app)
+
+# Initialize rate limiting
+limiter = Limiter(get_remote_address, app=app)
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection (WAL lets readers run during writes)"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA busy_timeout=30000')
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
 # ==================== DATABASE MODELS ====================
 
 class User(db.Model):
@@ -39,15 +111,17 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationship
-    items = db.relationship('Item', backref='user', lazy=True, cascade='all, delete-orphan')
+    items = db.relationship('Item', back_populates='user', cascade='all, delete-orphan')
     
     def set_password(self, password):
         """Hash and store password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = auth_pool.submit(
+            generate_password_hash, password, method=PASSWORD_HASH_METHOD
+        ).result()
     
     def check_password(self, password):
         """Verify password"""
-        return check_password_hash(self.password_hash, password)
+        return auth_pool.submit(check_password_hash, self.password_hash, password).result()
     
     def __repr__(self):
         return f'<User {self.email}>'
@@ -56,6 +130,11 @@ class User(db.Model):
 class Item(db.Model):
     """Item model for inventory"""
     __tablename__ = 'items'
+    __table_args__ = (
+        db.Index('ix_items_user_created', 'user_id', 'created_at'),
+        db.Index('ix_items_user_category', 'user_id', 'category'),
+        db.Index('ix_items_user_expiry', 'user_id', 'expiry_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -69,16 +148,19 @@ class Item(db.Model):
     low_stock_threshold = db.Column(db.Float, default=5)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def is_expired(self):
+    # Relationship
+    user = db.relationship('User', back_populates='items')
+    
+    def is_expired(self, today=None):
         """Check if item is expired"""
         if self.expiry_date:
-            return self.expiry_date < datetime.now().date()
+            return self.expiry_date < (today or current_date())
         return False
     
-    def is_expiring_soon(self, days=7):
+    def is_expiring_soon(self, today=None, days=7):
         """Check if item is expiring within X days"""
         if self.expiry_date:
-            days_left = (self.expiry_date - datetime.now().date()).days
+            days_left = (self.expiry_date - (today or current_date())).days
             return 0 <= days_left <= days
         return False
     
@@ -95,7 +177,7 @@ class Item(db.Model):
             'barcode': self.barcode or '',
             'quantity': self.quantity,
             'unit': self.unit,
-            'expiry_date': self.expiry_date.strftime('%Y-%m-%d') if self.expiry_date else '',
+            'expiry_date': self.expiry_date.isoformat() if self.expiry_date else '',
             'location': self.location,
             'low_stock_threshold': self.low_stock_threshold
         }
@@ -110,25 +192,108 @@ os.makedirs(db_dir, exist_ok=True)
 
 # ==================== HELPER FUNCTIONS ====================
 
+def current_date():
+    """Today's date, reusing the per-request value when there is one"""
+    if has_request_context() and 'today' in g:
+        return g.today
+    return date.today()
+
+def ensure_indexes():
+    """Create any model indexes missing from an existing database"""
+    for index in Item.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+
+def ensure_search_index():
+    """Create the FTS5 table that mirrors items for search, kept in sync by triggers"""
+    with db.engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='items_fts'"
+        )).first()
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+            "name, category, barcode, content='items', content_rowid='id')"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN "
+            "INSERT INTO items_fts(rowid, name, category, barcode) "
+            "VALUES (new.id, new.name, new.category, new.barcode); END"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN "
+            "INSERT INTO items_fts(items_fts, rowid, name, category, barcode) "
+            "VALUES ('delete', old.id, old.name, old.category, old.barcode); END"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE ON items BEGIN "
+            "INSERT INTO items_fts(items_fts, rowid, name, category, barcode) "
+            "VALUES ('delete', old.id, old.name, old.category, old.barcode); "
+            "INSERT INTO items_fts(rowid, name, category, barcode) "
+            "VALUES (new.id, new.name, new.category, new.barcode); END"
+        ))
+        # Index rows that existed before the search table did
+        if not exists:
+            conn.execute(text("INSERT INTO items_fts(items_fts) VALUES ('rebuild')"))
+
+def init_db():
+    """Create tables, indexes and the search table (call inside an app context)"""
+    db.create_all()
+    ensure_indexes()
+    ensure_search_index()
+
+def fts_query(search):
+    """Turn user input into an FTS5 prefix query, quoting each word"""
+    terms = ['"' + word.replace('"', '""') + '"*' for word in search.split()]
+    return ' '.join(terms)
+
+# Lightweight, cache-safe view of the logged-in user
+CurrentUser = namedtuple('CurrentUser', ['id', 'name', 'email'])
+
+@cache.memoize(timeout=60)
+def _load_user(user_id):
+    """Load user identity as a plain dict (never cache ORM objects)"""
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    return {'id': user.id, 'name': user.name, 'email': user.email}
+
+@cache.memoize(timeout=300)
+def user_categories(user_id):
+    """Sorted list of distinct item categories for a user"""
+    return db.session.execute(
+        select(Item.category).where(Item.user_id == user_id).distinct().order_by(Item.category)
+    ).scalars().all()
+
 def get_current_user():
-    """Get current logged-in user from session"""
+    """Get current logged-in user from session (memoized per request)"""
     from flask import session
-    if 'user_id' in session:
-        return User.query.get(session['user_id'])
-    return None
-
-def login_required(f):
-    """Decorator to require login"""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not get_current_user():
-            flash('Please log in first', 'warning')
-            return redirect(url_for('login'))
-        return f(*args, **kwargs)
-    return decorated_function
+    if 'user_id' not in session:
+        return None
+    if '_current_user' not in g:
+        data = _load_user(session['user_id'])
+        g._current_user = CurrentUser(**data) if data else None
+    return g._current_user
 
 # ==================== ROUTES ====================
 
+@app.before_request
+def set_today():
+    """Resolve today's date once per request"""
+    g.today = date.today()
+
+# Endpoints reachable without logging in
+PUBLIC_ENDPOINTS = {'home', 'signup', 'login', 'logout', 'static'}
+
+@app.before_request
+def require_login():
+    """Require a logged-in user for every endpoint not listed as public"""
+    if request.endpoint is None or request.endpoint in PUBLIC_ENDPOINTS:
+        return None
+    user = get_current_user()
+    if not user:
+        flash('Please log in first', 'warning')
+        return redirect(url_for('login'))
+    g.user = user
+
 # ===== PUBLIC ROUTES =====
 
 @app.route('/')
@@ -177,6 +342,7 @@ def signup():
     return render_template('signup.html')
 
 @app.route('/login', methods=['GET', 'POST'])
+@limiter.limit('10 per minute', methods=['POST'])
 def login():
     """Login route"""
     if request.method == 'POST':
@@ -199,57 +365,73 @@ def login():
 def logout():
     """Logout route"""
     from flask import session
-    session.pop('user_id', None)
+    user_id = session.pop('user_id', None)
+    if user_id is not None:
+        cache.delete_memoized(_load_user, user_id)
     flash('Logged out successfully', 'info')
     return redirect(url_for('home'))
 
 # ===== AUTHENTICATED ROUTES =====
 
 @app.route('/dashboard')
-@login_required
 def dashboard():
     """Dashboard with statistics"""
-    user = get_current_user()
-    items = Item.query.filter_by(user_id=user.id).all()
+    user = g.user
     
-    today = datetime.now().date()
+    today = g.today
+    soon = today + timedelta(days=7)
     
-    # Calculate stats
-    total_items = len(items)
-    low_stock_items = [item for item in items if item.is_low_stock()]
-    expiring_soon = [item for item in items if item.is_expiring_soon()]
-    expired_items = [item for item in items if item.is_expired()]
+    # Calculate stats in a single aggregate query
+    row = db.session.execute(select(
+        func.count(Item.id),
+        func.sum(case((Item.quantity < Item.low_stock_threshold, 1), else_=0)),
+        func.sum(case((and_(Item.expiry_date >= today, Item.expiry_date <= soon), 1), else_=0)),
+        func.sum(case((Item.expiry_date < today, 1), else_=0))
+    ).where(Item.user_id == user.id)).one()
     
     stats = {
-        'total_items': total_items,
-        'low_stock_count': len(low_stock_items),
-        'expiring_soon_count': len(expiring_soon),
-        'expired_count': len(expired_items)
+        'total_items': row[0],
+        'low_stock_count': row[1] or 0,
+        'expiring_soon_count': row[2] or 0,
+        'expired_count': row[3] or 0
     }
     
     return render_template('dashboard.html', stats=stats, user=user)
 
 @app.route('/items')
-@login_required
 def items_list():
     """List all items"""
-    user = get_current_user()
+    user = g.user
     search = request.args.get('search', '').strip().lower()
     category_filter = request.args.get('category', '').strip()
     
-    query = Item.query.filter_by(user_id=user.id)
+    today = g.today
+    
+    # Compute status flags in SQL so the template doesn't call per-row methods
+    stmt = select(
+        Item,
+        (Item.quantity < Item.low_stock_threshold).label('low'),
+        (Item.expiry_date < today).label('expired'),
+        and_(Item.expiry_date >= today, Item.expiry_date <= today + timedelta(days=7)).label('soon')
+    ).options(raiseload('*')).where(Item.user_id == user.id)
     
     # Apply filters
     if search:
-        query = query.filter(Item.name.ilike(f'%{search}%'))
+        matches = select(literal_column('rowid')).select_from(text('items_fts')).where(
+            text('items_fts MATCH :q').bindparams(q=fts_query(search))
+        )
+        stmt = stmt.where(Item.id.in_(matches))
     
     if category_filter:
-        query = query.filter_by(category=category_filter)
+        stmt = stmt.where(Item.category == category_filter)
     
-    items = query.order_by(Item.created_at.desc()).all()
+    items = []
+    for item, low, expired, soon in db.session.execute(stmt.order_by(Item.created_at.desc())):
+        item.low_stock, item.expired, item.expiring_soon = bool(low), bool(expired), bool(soon)
+        items.append(item)
     
     # Get unique categories
-    all_categories = list(set([item.category for item in Item.query.filter_by(user_id=user.id).all()]))
+    all_categories = user_categories(user.id)
     
     return render_template(
         'items_list.html',
@@ -261,10 +443,9 @@ def items_list():
     )
 
 @app.route('/item/add', methods=['GET', 'POST'])
-@login_required
 def add_item():
     """Add new item"""
-    user = get_current_user()
+    user = g.user
     
     if request.method == 'POST':
         name = request.form.get('name', '').strip()
@@ -291,7 +472,7 @@ def add_item():
         expiry_date = None
         if expiry_date_str:
             try:
-                expiry_date = datetime.strptime(expiry_date_str, '%Y-%m-%d').date()
+                expiry_date = date.fromisoformat(expiry_date_str)
             except ValueError:
                 flash('Invalid date format', 'danger')
                 return render_template('item_form.html', mode='add', user=user)
@@ -311,6 +492,7 @@ def add_item():
         
         db.session.add(item)
         db.session.commit()
+        cache.delete_memoized(user_categories, user.id)
         
         flash(f'Item "{name}" added successfully!', 'success')
         return redirect(url_for('items_list'))
@@ -318,16 +500,10 @@ def add_item():
     return render_template('item_form.html', mode='add', user=user)
 
 @app.route('/item/<int:item_id>/edit', methods=['GET', 'POST'])
-@login_required
 def edit_item(item_id):
     """Edit item"""
-    user = get_current_user()
-    item = Item.query.get_or_404(item_id)
-    
-    # Check ownership
-    if item.user_id != user.id:
-        flash('Unauthorized', 'danger')
-        return redirect(url_for('items_list'))
+    user = g.user
+    item = Item.query.filter_by(id=item_id, user_id=user.id).first_or_404()
     
     if request.method == 'POST':
         item.name = request.form.get('name', item.name).strip()
@@ -346,7 +522,7 @@ def edit_item(item_id):
         expiry_date_str = request.form.get('expiry_date', '')
         if expiry_date_str:
             try:
-                item.expiry_date = datetime.strptime(expiry_date_str, '%Y-%m-%d').date()
+                item.expiry_date = date.fromisoformat(expiry_date_str)
             except ValueError:
                 flash('Invalid date format', 'danger')
                 return render_template('item_form.html', mode='edit', item=item, user=user)
@@ -354,73 +530,72 @@ def edit_item(item_id):
             item.expiry_date = None
         
         db.session.commit()
+        cache.delete_memoized(user_categories, user.id)
         flash(f'Item "{item.name}" updated successfully!', 'success')
         return redirect(url_for('items_list'))
     
     return render_template('item_form.html', mode='edit', item=item, user=user)
 
 @app.route('/item/<int:item_id>/delete', methods=['POST'])
-@login_required
 def delete_item(item_id):
     """Delete item"""
-    user = get_current_user()
-    item = Item.query.get_or_404(item_id)
-    
-    if item.user_id != user.id:
-        flash('Unauthorized', 'danger')
-        return redirect(url_for('items_list'))
+    user = g.user
+    item = Item.query.filter_by(id=item_id, user_id=user.id).first_or_404()
     
     item_name = item.name
     db.session.delete(item)
     db.session.commit()
+    cache.delete_memoized(user_categories, user.id)
     
     flash(f'Item "{item_name}" deleted successfully!', 'success')
     return redirect(url_for('items_list'))
 
 @app.route('/scan')
-@login_required
 def scan():
     """Barcode scanner page"""
-    user = get_current_user()
-    return render_template('scan.html', user=user)
+    return render_template('scan.html', user=g.user)
 
 @app.route('/export-csv')
-@login_required
 def export_csv():
     """Export items as CSV"""
-    user = get_current_user()
-    items = Item.query.filter_by(user_id=user.id).all()
-    
-    # Create CSV
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=[
-        'name', 'category', 'barcode', 'quantity', 'unit', 
-        'expiry_date', 'location', 'low_stock_threshold'
-    ])
-    
-    writer.writeheader()
-    for item in items:
-        writer.writerow(item.to_dict())
-    
-    output.seek(0)
-    
-    # Convert to BytesIO for download
-    mem = BytesIO()
-    mem.write(output.getvalue().encode('utf-8'))
-    mem.seek(0)
-    
-    return send_file(
-        mem,
+    user_id = g.user.id
+    
+    def generate():
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([
+            'name', 'category', 'barcode', 'quantity', 'unit', 
+            'expiry_date', 'location', 'low_stock_threshold'
+        ])
+        
+        result = db.session.execute(select(
+            Item.name, Item.category, Item.barcode, Item.quantity, Item.unit,
+            Item.expiry_date, Item.location, Item.low_stock_threshold
+        ).where(Item.user_id == user_id).execution_options(yield_per=EXPORT_BATCH_SIZE))
+        
+        yield buffer.getvalue().encode('utf-8')
+        
+        # Encode one batch of rows per chunk sent to the client
+        for chunk in result.partitions():
+            buffer.seek(0)
+            buffer.truncate(0)
+            writer.writerows(
+                (n, c, b or '', q, u, (d.isoformat() if d else ''), loc, t)
+                for n, c, b, q, u, d, loc, t in chunk
+            )
+            yield buffer.getvalue().encode('utf-8')
+    
+    filename = f'inventory_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return Response(
+        stream_with_context(generate()),
         mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'inventory_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 @app.route('/import-csv', methods=['POST'])
-@login_required
 def import_csv():
     """Import items from CSV"""
-    user = get_current_user()
+    user = g.user
     
     if 'file' not in request.files:
         flash('No file selected', 'danger')
@@ -440,44 +615,66 @@ def import_csv():
         stream = file.stream.read().decode('UTF-8')
         csv_reader = csv.DictReader(StringIO(stream))
         
-        imported_count = 0
+        rows = []
         
         for row in csv_reader:
             try:
                 # Parse data
                 expiry_date = None
                 if row.get('expiry_date', '').strip():
-                    expiry_date = datetime.strptime(row['expiry_date'], '%Y-%m-%d').date()
+                    expiry_date = date.fromisoformat(row['expiry_date'].strip())
                 
                 quantity = float(row.get('quantity', 1))
                 threshold = float(row.get('low_stock_threshold', 5))
                 
-                # Create item
-                item = Item(
-                    user_id=user.id,
-                    name=row.get('name', 'Unknown').strip(),
-                    category=row.get('category', 'Other').strip(),
-                    barcode=row.get('barcode', '').strip(),
-                    quantity=quantity,
-                    unit=row.get('unit', 'pcs').strip(),
-                    expiry_date=expiry_date,
-                    location=row.get('location', 'Pantry').strip(),
-                    low_stock_threshold=threshold
-                )
-                
-                db.session.add(item)
-                imported_count += 1
+                rows.append({
+                    'user_id': user.id,
+                    'name': row.get('name', 'Unknown').strip(),
+                    'category': row.get('category', 'Other').strip(),
+                    'barcode': row.get('barcode', '').strip(),
+                    'quantity': quantity,
+                    'unit': row.get('unit', 'pcs').strip(),
+                    'expiry_date': expiry_date,
+                    'location': row.get('location', 'Pantry').strip(),
+                    'low_stock_threshold': threshold
+                })
             
             except Exception as e:
                 print(f"Error importing row: {e}", file=sys.stderr)
                 continue
         
-        db.session.commit()
+        # Look up items the user already has before inserting anything, so rows
+        # committed from this file are never mistaken for existing ones
+        keys = list({(r['name'], r['barcode']) for r in rows})
+        existing = set()
+        for start in range(0, len(keys), DEDUP_BATCH_SIZE):
+            existing.update(tuple(key) for key in db.session.execute(select(Item.name, Item.barcode).where(
+                Item.user_id == user.id,
+                tuple_(Item.name, Item.barcode).in_(keys[start:start + DEDUP_BATCH_SIZE])
+            )).all())
+        
+        new_rows = [r for r in rows if (r['name'], r['barcode']) not in existing]
+        skipped_count = len(rows) - len(new_rows)
+        imported_count = 0
+        
+        with db.session.no_autoflush:
+            # Insert in chunks to skip per-object ORM bookkeeping
+            for start in range(0, len(new_rows), IMPORT_BATCH_SIZE):
+                batch = new_rows[start:start + IMPORT_BATCH_SIZE]
+                db.session.bulk_insert_mappings(Item, batch)
+                db.session.commit()
+                imported_count += len(batch)
+        
+        if skipped_count:
+            flash(f'Skipped {skipped_count} items already in your inventory', 'info')
         flash(f'Successfully imported {imported_count} items!', 'success')
     
     except Exception as e:
         flash(f'Error importing CSV: {str(e)}', 'danger')
     
+    # Earlier chunks may have committed even if a later one failed
+    cache.delete_memoized(user_categories, user.id)
+    
     return redirect(url_for('items_list'))
 
 # ==================== ERROR HANDLERS ====================
@@ -498,7 +695,12 @@ if __name__ == '__main__':
     # Print DB URI and create tables at startup (avoid running at import time)
     with app.app_context():
         print("Using DB:", app.config.get('SQLALCHEMY_DATABASE_URI'))
-        db.create_all()
+        init_db()
+
+    if os.getenv('FLASK_ENV') != 'development':
+        print("Run in production with: gunicorn -c gunicorn.conf.py wsgi:app")
+        print("Set FLASK_ENV=development to start the development server")
+        sys.exit(0)
 
     print("=" * 60)
     print("🍳 Smart Kitchen Inventory System")
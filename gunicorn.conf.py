@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration for Smart Kitchen Inventory System
+"""
+
+import multiprocessing
+import os
+
+bind = '0.0.0.0:5000'
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = 'gthread'
+threads = 4
+preload_app = True
+
+# Worker processes must share state, so keep it in Redis unless overridden
+os.environ.setdefault('SESSION_TYPE', 'redis')
+os.environ.setdefault('CACHE_TYPE', 'RedisCache')
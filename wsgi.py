@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers (e.g. gunicorn wsgi:app)
+"""
+
+from app import app, db, init_db
+
+with app.app_context():
+    init_db()
+    # Don't hand pooled connections from the master process to forked workers
+    db.engine.dispose()